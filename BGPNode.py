@@ -37,11 +37,13 @@ Class variables:
     (a) ASN: integer - It is the autonomous system number.
     (b) isDetector: boolean - It states whether this ASN is connected
                               to a route collector or not.
-    (c) exportPolicy: dictionary - The export policy defined for
+    (c) collectorMask: integer - Bitmask of the route collectors this
+                                 ASN is connected to.
+    (d) exportPolicy: dictionary - The export policy defined for
                                    outbound traffic.
-    (d) importPolicy: dictionary - The import policy defind for
+    (e) importPolicy: dictionary - The import policy defind for
                                    inbound traffic.
-    (e) neighbours: dictionary - Tuples, ordered by ASN of the neighbours,
+    (f) neighbours: dictionary - Tuples, ordered by ASN of the neighbours,
                                  indicating the economical relationships
                                  (c2p,p2p,p2c) and local preference for the
                                  neighbour.
@@ -60,6 +62,7 @@ class BGPNode:
         self.neighbours = neighbours
 
         self.connectedToRouteCollector = False
+        self.collectorMask = 0
         self.routesUsingValleyFree = False
         self.groupedNeighbours = None
 
@@ -71,6 +74,9 @@ class BGPNode:
         self.locRIB = None
         self.backupLocRIB = None
 
+        self.originatesRoute = False
+        self.backupOriginatesRoute = False
+
         "Initialise groupedNeighbours for faster outbound traffic"
         self.groupNeighbours()
 
@@ -79,16 +85,32 @@ class BGPNode:
 
     Two groups are taken into account, either send traffic to all
     neighbours or send traffic to my customers only.
+
+    Input argument:
+        (a) aliases: dictionary - Optional, maps neighbours that are
+                                  collapsed into an aggregate node onto
+                                  the identifier of that aggregate.
     """
-    def groupNeighbours(self):
+    def groupNeighbours(self, aliases=None):
         "'0': C2P, '1': P2P, '2': P2C, '3': Everything"
         self.groupedNeighbours = {0: [], 1: [], 2: [], 3: []}
+        aliasedNeighbours = dict()
 
         for asn in self.neighbours:
-            self.groupedNeighbours[3].append(asn)
+            target = asn
+
+            "An aggregate node only receives a single message"
+            if aliases is not None and asn in aliases:
+                target = aliases[asn]
+
+                if target in aliasedNeighbours:
+                    continue
+                aliasedNeighbours[target] = 1
+
+            self.groupedNeighbours[3].append(target)
 
             if self.neighbours[asn][0] == 2:
-                self.groupedNeighbours[2].append(asn)
+                self.groupedNeighbours[2].append(target)
 
     """
     Resets the BGP node's entire RIB and backup.
@@ -100,12 +122,34 @@ class BGPNode:
         self.locRIB = None
         self.backupLocRIB = None
 
+        self.originatesRoute = False
+        self.backupOriginatesRoute = False
+
     """
     Resets the BGP node's Adj-RIB-In and Loc-RIB from the backup.
     """
     def resetFromBackup(self):
         self.adjRIBIn = makeCopy(self.backupAdjRIBIn)
         self.locRIB = makeCopy(self.backupLocRIB)
+        self.originatesRoute = self.backupOriginatesRoute
+
+    """
+    Copies the RIB, its backup and the traffic principle from another BGP node.
+
+    Input argument:
+        (a) other: BGPNode - The BGP node to copy from.
+    """
+    def copyRIB(self, other):
+        self.adjRIBIn = makeCopy(other.adjRIBIn)
+        self.backupAdjRIBIn = makeCopy(other.backupAdjRIBIn)
+
+        self.locRIB = makeCopy(other.locRIB)
+        self.backupLocRIB = makeCopy(other.backupLocRIB)
+
+        self.originatesRoute = other.originatesRoute
+        self.backupOriginatesRoute = other.backupOriginatesRoute
+
+        self.routesUsingValleyFree = other.routesUsingValleyFree
 
     """
     Indicates whether the BGP node is receiving valid BGP messages
@@ -125,6 +169,7 @@ class BGPNode:
         if continueWithHijack:
             self.backupAdjRIBIn = makeSmartCopy(self.adjRIBIn, 10)
             self.backupLocRIB = makeCopy(self.locRIB)
+            self.backupOriginatesRoute = self.originatesRoute
         else:
             self.adjRIBIn = makeCopy(self.backupAdjRIBIn)
             self.backupAdjRIBIn = []
@@ -132,6 +177,9 @@ class BGPNode:
             self.locRIB = makeCopy(self.backupLocRIB)
             self.backupLocRIB = None
 
+            self.originatesRoute = self.backupOriginatesRoute
+            self.backupOriginatesRoute = False
+
     """
     Sets whether this BGP node routes outbound traffic, according to
     the valley-free principle.
@@ -153,6 +201,29 @@ class BGPNode:
     def setDetector(self, isDetector):
         self.connectedToRouteCollector = isDetector
 
+    """
+    Sets the route collectors this BGP node is connected to.
+
+    Every route collector is represented by a single bit, a node
+    connected to at least one route collector is a detector.
+
+    Input argument:
+        (a) collectorMask: integer - Bitmask of the route collectors.
+    """
+    def setCollectors(self, collectorMask):
+        self.collectorMask = collectorMask
+        self.connectedToRouteCollector = collectorMask != 0
+
+    """
+    Makes this BGP node the origin of the route.
+
+    The origin announces its own ASN as the path, even when it selected a route
+    of another origin before, and ignores all routes it receives afterwards.
+    """
+    def setOrigin(self):
+        self.originatesRoute = True
+        self.locRIB = None
+
     """
     Detects whether the BGP node already appeared in a list of ASNs.
 
@@ -218,11 +289,17 @@ class BGPNode:
 
     When the path does not contain the BGP node's own identifier and is
     the best path from all paths in the Adj-RIB-In, it is the new selected path.
+    Returns whether the selected path changed, as only a changed path has to
+    be shared with the neighbours again.
 
     Input argument:
         (a) path: string - Received AS path.
     """
     def updateSelectedPath(self, path):
+        "The origin always prefers its own route"
+        if self.originatesRoute:
+            return False
+
         parts = path.split(",")
 
         "Loop prevention"
@@ -238,8 +315,9 @@ class BGPNode:
         self.removeOldPath(parts[-1])
         bestPath = self.selectBestRoute(path, parts)
 
+        isChanged = bestPath != self.locRIB
         self.locRIB = bestPath
-        return True
+        return isChanged
 
     """
     Returns a tuple representing the selected path from the Loc-RIB completed
@@ -298,8 +376,16 @@ class BGPNode:
             return None
         return self.locRIB[3]
 
+    def getSelectedRouteOrigin(self):
+        if self.locRIB is None:
+            return None
+        return self.locRIB[0].split(",")[0]
+
     def getAlternativeRoutes(self):
         return self.adjRIBIn
 
     def isDetector(self):
         return self.connectedToRouteCollector
+
+    def getCollectorMask(self):
+        return self.collectorMask
@@ -1,5 +1,6 @@
 from collections import deque
 from GraphGenerator import GraphGenerator
+from SnapshotStore import SnapshotStore
 
 import os
 import sys
@@ -14,6 +15,11 @@ A graph instance is created that can be used to simulate the spreading of BGP me
 Input arguments:
 	(a) locationRelations: string - Location of the CAIDA relationships on this machine.
 	(b) locationDelegatedFiles: string - Location of the RIR delegated files on this machine.
+	(c) contractStubs: boolean - Whether stubs are collapsed into aggregate nodes. This
+								requires the valley-free principle when simulating.
+	(d) snapshots: dictionary - Optional, the locations of further CAIDA relationships by
+								snapshot name. These are stored as differences with the
+								graph of 'locationRelations'.
 """
 class BGPSimulator:
 
@@ -21,22 +27,42 @@ class BGPSimulator:
 	Constructor for object of class BGPSimulator.
 	Creates the class variable 'graph' from the given arguments.
 	"""
-	def __init__(self, locationRelations, locationDelegatedFiles):
-		graph_generator = GraphGenerator(locationRelations, locationDelegatedFiles)
-		graph_generator.constructGraph()
+	def __init__(self, locationRelations, locationDelegatedFiles, contractStubs=False, snapshots=None):
+		if snapshots is None:
+			graph_generator = GraphGenerator(locationRelations, locationDelegatedFiles)
+			graph_generator.constructGraph(contractStubs)
+		else:
+			graph_generator = SnapshotStore(locationRelations, locationDelegatedFiles)
+			graph_generator.constructGraph(contractStubs)
+
+			"Snapshots are stored as differences with the constructed graph"
+			for name in snapshots:
+				graph_generator.addSnapshot(name, snapshots[name])
+
+		self.graphGenerator = graph_generator
 		self.graph = graph_generator.getGraph()
+		self.stubAggregates = graph_generator.getStubAggregates()
+
+		self.collectorNames = graph_generator.getCollectorNames()
+		self.collectorMasks = graph_generator.getCollectorMasks()
+		self.projectMasks = graph_generator.getProjectMasks()
 
 		self.caughtByDector = dict()
+		self.detectedCollectors = 0
+		self.detectionHops = dict()
 		self.isInHijackMode = False
+		self.usesValleyFree = False
 		self.queue = deque()
 		self.usedBGPNodes = dict()
+		self.processedMessages = 0
 
 	"""
 	Resets the graph to the instance at time of initialisation.
 
 	If the simulator is in hijack mode, the BGPNodes are reset from their backup to
 	allow for a new hijack simulation. For a full reset, first put the simulator out 
-	of hijack mode.
+	of hijack mode. A full reset also collapses the stubs that were restored as individual
+	nodes, to originate a message, into their aggregates again.
 	"""
 	def reset(self):
 		if self.isInHijackMode:
@@ -46,9 +72,40 @@ class BGPSimulator:
 			for BGPNodeNumber in self.usedBGPNodes:
 				self.graph[BGPNodeNumber].reset()
 
+			self.graphGenerator.recontractStubs()
+
 		self.caughtByDector.clear()
+		self.detectedCollectors = 0
+		self.detectionHops.clear()
 		self.queue = deque()
 		self.usedBGPNodes.clear()
+		self.processedMessages = 0
+
+	"""
+	Resets every node in the graph and puts the simulator out of hijack mode.
+	"""
+	def resetAll(self):
+		self.isInHijackMode = False
+
+		for bgpnode in self.graph.values():
+			bgpnode.reset()
+
+		self.reset()
+
+	"""
+	Switches the graph to another snapshot of the AS relationships.
+
+	The graph is fully reset first. Only the nodes whose links differ between the
+	snapshots are changed.
+
+	Input argument:
+		(a) name: string - The name of the snapshot, None for the graph of 'locationRelations'.
+	"""
+	def setSnapshot(self, name):
+		self.resetAll()
+
+		for asn in self.graphGenerator.setActiveSnapshot(name):
+			self.graph[asn].setTrafficPrinciple(self.usesValleyFree)
 
 	"""
 	Sets all nodes in the graph to use the Valley-Free principle or not.
@@ -57,7 +114,9 @@ class BGPSimulator:
 		(a) useValleyFree: boolean - Indication whether the Valley-Free principle is used or not.
 	"""
 	def setValleyFree(self, useValleyFree):
-		for bgpnode in self.graph:
+		self.usesValleyFree = useValleyFree
+
+		for bgpnode in self.graph.values():
 			bgpnode.setTrafficPrinciple(useValleyFree)
 
 	"""
@@ -67,36 +126,137 @@ class BGPSimulator:
 		(a) continueWithHijack: boolean - Indication whether hijack messages are sent.
 	"""
 	def setToHijack(self, continueWithHijack):
-		self.isInHijackMode = True
+		self.isInHijackMode = continueWithHijack
 
-		for bgpnode in self.graph:
+		for bgpnode in self.graph.values():
 			bgpnode.setRIB(continueWithHijack)
 
 	"""
 	Simulates the BGP communication process after a message has been passed to the protocol.
 
+	The source originates the message, even when it selected a route of another origin
+	before, as is the case for a hijack. A detector catches the message once it selects
+	a route originated by the source. Every route collector it is connected to is recorded
+	together with the hop at which it caught the message, the number of ASes in the
+	selected path, or hop 0 for a source that is a detector itself. A detector that only
+	receives the message without selecting it, does not catch it. The simulation stops early once every requested collector set has
+	resolved, i.e. at least one of its collectors has caught the message. By default the
+	simulation stops at the first detector, like the collector project 'all'. With an
+	empty list of collector sets the simulation runs until no messages are left.
+
+	When stubs are contracted, a stub originating the message is first restored as an
+	individual node.
+
 	It is your own responsibility to reset the graph before running a new simulation.
+
+	Input arguments:
+		(a) sourceASN: string - The ASN originating the message.
+		(b) collectorSets: list - Names of collector projects and/or individual collectors
+								 to resolve, the collector project 'all' when omitted.
 	"""
-	def simulate(self, sourceASN):
+	def simulate(self, sourceASN, collectorSets=None):
 		"Setup"
+		pendingSets = self.getCollectorSetMasks(collectorSets)
+		stopsEarly = len(pendingSets) > 0
+
+		if len(self.stubAggregates) > 0 and not self.usesValleyFree:
+			raise ValueError("Contracted stubs can only be simulated using the valley-free principle")
+
+		if sourceASN in self.graphGenerator.getAggregateOf():
+			self.graphGenerator.expandStub(sourceASN)
+
 		self.usedBGPNodes[sourceASN] = 1
+		self.graph[sourceASN].setOrigin()
 		self.addQueItemsFromASN(sourceASN)
 
+		"A source peering with route collectors is caught by them at hop 0"
+		if self.graph[sourceASN].isDetector():
+			self.caughtByDector[sourceASN] = 0
+			self.recordDetection(self.graph[sourceASN].getCollectorMask() & ~self.detectedCollectors, 0)
+			pendingSets = [mask for mask in pendingSets if not mask & self.detectedCollectors]
+
+			if stopsEarly and len(pendingSets) == 0:
+				return
+
 		"Run simulation"
 		while 0 != len(self.queue):
 			"Message passing"
 			asn, path = self.queue.popleft()
 
-			self.needsToBeReset[asn] = 1
+			self.processedMessages += 1
+			self.usedBGPNodes[asn] = 1
 			isUpdated = self.graph[asn].updateSelectedPath(path)
 			
 			if isUpdated:
 				self.addQueItemsFromASN(asn)
 
-			"Hijack detection"
-			if self.graph[asn].isDetector():
-				self.caughtByDector[asn] = 1
-				break
+			"Hijack detection, the detector has to select the route of the source"
+			if isUpdated and self.graph[asn].isDetector() and self.graph[asn].getSelectedRouteOrigin() == sourceASN:
+				hop = self.graph[asn].getSelectedRoute().count(",") + 1
+
+				if asn not in self.caughtByDector:
+					self.caughtByDector[asn] = hop
+
+				newCollectors = self.graph[asn].getCollectorMask() & ~self.detectedCollectors
+
+				if newCollectors:
+					self.recordDetection(newCollectors, hop)
+					pendingSets = [mask for mask in pendingSets if not mask & self.detectedCollectors]
+
+					if stopsEarly and len(pendingSets) == 0:
+						break
+
+	"""
+	Converts names of collector projects and individual collectors into bitmasks.
+
+	Input argument:
+		(a) collectorSets: list - Names of collector projects and/or individual collectors,
+								 the collector project 'all' when None.
+	"""
+	def getCollectorSetMasks(self, collectorSets):
+		if collectorSets is None:
+			collectorSets = ["all"]
+
+		masks = []
+
+		for name in collectorSets:
+			if name in self.projectMasks:
+				masks.append(self.projectMasks[name])
+			elif name in self.collectorMasks:
+				masks.append(self.collectorMasks[name])
+			else:
+				raise ValueError("Unknown collector project or collector: " + str(name))
+
+		return masks
+
+	"""
+	Records the hop at which route collectors saw the message for the first time.
+
+	Input arguments:
+		(a) newCollectors: integer - Bitmask of the collectors that saw the message.
+		(b) hop: integer - Number of ASes in the selected path.
+	"""
+	def recordDetection(self, newCollectors, hop):
+		self.detectedCollectors |= newCollectors
+
+		while newCollectors:
+			collectorBit = newCollectors & -newCollectors
+			self.detectionHops[self.collectorNames[collectorBit.bit_length() - 1]] = hop
+			newCollectors ^= collectorBit
+
+	"""
+	Returns the lowest hop at which any collector in the bitmask saw the message,
+	or None when none of them saw it.
+
+	Input argument:
+		(a) collectorMask: integer - Bitmask of route collectors.
+	"""
+	def getFirstDetection(self, collectorMask):
+		hops = [self.detectionHops[collector] for collector in self.detectionHops if self.collectorMasks[collector] & collectorMask]
+
+		if len(hops) == 0:
+			return None
+		return min(hops)
 
 	def addQueItemsFromASN(self, asn):
 		publishRequest = self.graph[asn].preparePublishRequest() 
@@ -109,12 +269,48 @@ class BGPSimulator:
 			return True
 		return False
 
+	"""
+	Returns the used BGP nodes by ASN, where every used aggregate node is expanded
+	into the stubs it acts on behalf of.
+	"""
+	def expandUsedBGPNodes(self):
+		usedNodes = dict()
+
+		for asn in self.usedBGPNodes:
+			if asn in self.stubAggregates:
+				for stubASN in self.stubAggregates[asn]:
+					usedNodes[stubASN] = self.graph[asn]
+			else:
+				usedNodes[asn] = self.graph[asn]
+
+		return usedNodes
+
 	"Getters"
+	def getASNs(self):
+		return list(self.graphGenerator.getRelationships())
+
+	def getRelationships(self):
+		return self.graphGenerator.getRelationships()
+
 	def getUsedBGPNodes(self):
-		return self.usedBGPNodes
+		return { asn:1 for asn in self.expandUsedBGPNodes() }
 
 	def getSelectedPaths(self):
-		return { asn:self.graph[asn].getSelectedRoute() for asn in self.usedBGPNodes }
+		return { asn:bgpnode.getSelectedRoute() for asn, bgpnode in self.expandUsedBGPNodes().items() }
 
 	def getAlternativePaths(self):
-		return { asn:self.graph[asn].getAlternativeRoutes() for asn in self.usedBGPNodes }
+		return { asn:bgpnode.getAlternativeRoutes() for asn, bgpnode in self.expandUsedBGPNodes().items() }
+
+	def getProcessedMessages(self):
+		return self.processedMessages
+
+	def getCollectorDetections(self):
+		return { collector:self.detectionHops.get(collector) for collector in self.collectorNames }
+
+	def getProjectDetections(self):
+		return { project:self.getFirstDetection(self.projectMasks[project]) for project in self.projectMasks }
+
+	def getActiveSnapshot(self):
+		if isinstance(self.graphGenerator, SnapshotStore):
+			return self.graphGenerator.getActiveSnapshot()
+		return None
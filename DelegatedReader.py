@@ -53,4 +53,4 @@ class DelegatedReader:
 	
 	"Getters"	
 	def getAllocatedASNs(self):
-		return self.asns
+		return self.allocatedASNs
@@ -65,3 +65,6 @@ class DetectorASReader:
 
 	def getPCHDetectors(self):
 		return self.getUniqueASN(self.pchPeerASN)
+
+	def getCollectorProjects(self):
+		return {"ripe": self.ripePeerASN, "routeviews": self.routeviewsPeerASN, "pch": self.pchPeerASN}
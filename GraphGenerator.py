@@ -20,6 +20,10 @@ relationships, consists of three phases:
 		There are ASes connected to route collectors, which are able to collect information
 		used for hijack detection. These nodes in the graph should be marked as detectors
 		to be used in any detection simulation.
+	4) Contracting stubs (optional)
+		Stub ASes only have providers and, under the valley-free principle, never pass
+		on a route. Stubs sharing the same providers are replaced by a single aggregate
+		node, shrinking the graph the BGP messages are propagated through.
 		
 Class variables:
 	(a) fileLocationRelations: string - The location of CAIDA's AS relationship file.
@@ -34,6 +38,16 @@ class GraphGenerator:
 
 		self.nodes = dict()
 		self.relationships = dict()
+		self.allocatedASNs = dict()
+
+		self.collectorNames = []
+		self.collectorMasks = dict()
+		self.projectMasks = dict()
+		self.detectorMasks = dict()
+
+		self.stubAggregates = dict()
+		self.aggregateOf = dict()
+		self.expandedStubs = dict()
 
 	def retrieveASRelations(self):
 		rr = RelationshipsReader(self.relationsFileLocation)
@@ -45,12 +59,19 @@ class GraphGenerator:
 		dr.parse()
 		return dr.getAllocatedASNs()
 
-	def retrieveAllDetectors(self):
+	def retrieveCollectorProjects(self):
 		dr = DetectorASReader()
 		dr.parse()
-		return dr.getAllDetectors()
+		return dr.getCollectorProjects()
 
-	def constructGraph(self):
+	"""
+	Constructs the graph.
+
+	Input argument:
+		(a) contractStubs: boolean - Indicating whether stubs are collapsed into
+									aggregate nodes or not.
+	"""
+	def constructGraph(self, contractStubs=False):
 		"Stage 1: parsing AS (economical relations)"
 		self.relationships = self.retrieveASRelations()
 
@@ -66,45 +87,67 @@ class GraphGenerator:
 		"Stage 3: mark nodes as detectors"
 		self.markDetectors()
 
+		"Stage 4: contract stubs"
+		if contractStubs:
+			self.contractStubs()
+
 	"""
 	Filters ASNs not in use from the data.
 	"""
 	def filter(self):
-		allocatedASNs = self.retrieveAllocatedASNs()
+		self.allocatedASNs = self.retrieveAllocatedASNs()
+		self.relationships = self.filterRelations(self.relationships)
+
+	"""
+	Returns the relation data without the ASNs that are not allocated.
+
+	Input argument:
+		(a) relationships: dictionary - Relation data as parsed by the RelationshipsReader.
+	"""
+	def filterRelations(self, relationships):
 		existingRelations = dict()
 
-		for asn in self.relationships:
-			if asn in allocatedASNs:
+		for asn in relationships:
+			if asn in self.allocatedASNs:
 				existingRelations[asn] = ([], [], [], [])
 
-				for relationType in range(len(self.relationships[asn])):
-					for neighbourASN in self.relationships[asn][relationType]:
-						if neighbourASN in allocatedASNs:
+				for relationType in range(len(relationships[asn])):
+					for neighbourASN in relationships[asn][relationType]:
+						if neighbourASN in self.allocatedASNs:
 							existingRelations[asn][relationType].append(neighbourASN)
 
-		self.relationships = existingRelations
+		return existingRelations
 
 	"""
 	Formats the relation data into an easy-to-use format for the BGPNode class.
+	"""
+	def convert(self):
+		self.relationships = self.formatRelations(self.relationships)
+
+	"""
+	Returns the relation data in an easy-to-use format for the BGPNode class.
 
 	It creates a dictionary for each ASN, which contains tuples with neighbour data,
 	ordered by the neighbours' ASN. The default local preference is passed to all
 	neighbours, indicating it is not used.
+
+	Input argument:
+		(a) relationships: dictionary - Relation data filtered by 'filterRelations'.
 	"""
-	def convert(self):
+	def formatRelations(self, relationships):
 		formattedRelations = dict()
 		defaultLocalPreference = 0
 
-		for asn in self.relationships:
+		for asn in relationships:
 			neighbours = dict()
 
-			for relationType in range(len(self.relationships[asn])):
-				for neighbourASN in self.relationships[asn][relationType]:
+			for relationType in range(len(relationships[asn])):
+				for neighbourASN in relationships[asn][relationType]:
 					neighbours[neighbourASN] = (relationType, defaultLocalPreference)
 
 			formattedRelations[asn] = neighbours
 
-		self.relationships = formattedRelations
+		return formattedRelations
 				
 	"""
 	Instantiates all nodes.
@@ -118,15 +161,184 @@ class GraphGenerator:
 	"""
 	Marks nodes as detectors.
 
-	If an ASN appears in the list of detectors, this BGPNode is set to be a detector.
+	Every route collector is assigned its own bit. The bits of the collectors belonging
+	to the same collector project are combined into a project mask, the project 'all'
+	contains every collector. If an ASN peers with route collectors, its BGPNode is given
+	the bitmask of those collectors and thereby becomes a detector.
 	"""
 	def markDetectors(self):
-		detectorASNs = self.retrieveAllDetectors()
+		collectorProjects = self.retrieveCollectorProjects()
+		self.projectMasks["all"] = 0
+
+		for project in collectorProjects:
+			self.projectMasks[project] = 0
+
+			for collector in collectorProjects[project]:
+				collectorBit = 1 << len(self.collectorNames)
+				self.collectorNames.append(collector)
+				self.collectorMasks[collector] = collectorBit
+				self.projectMasks[project] |= collectorBit
+				self.projectMasks["all"] |= collectorBit
+
+				for asn in collectorProjects[project][collector]:
+					self.detectorMasks[asn] = self.detectorMasks.get(asn, 0) | collectorBit
+
+		for asn in self.detectorMasks:
+			if asn in self.nodes:
+				self.nodes[asn].setCollectors(self.detectorMasks[asn])
+
+	"""
+	Indicates whether an AS can be collapsed into an aggregate node.
+
+	A stub that is not a detector only has providers. Every route it receives comes
+	from a provider and is therefore never shared under the valley-free principle.
+
+	Input argument:
+		(a) asn: string - The ASN of the AS.
+	"""
+	def isContractibleStub(self, asn):
+		if len(self.relationships[asn]) == 0 or asn in self.detectorMasks:
+			return False
+
+		for neighbourASN in self.relationships[asn]:
+			if self.relationships[asn][neighbourASN][0] != 1:
+				return False
+
+		return True
+
+	"""
+	Returns, for every neighbour of a provider, the number of detectors preceding it
+	in the order in which the provider sends its messages.
+
+	Input argument:
+		(a) providerASN: string - The ASN of the provider.
+	"""
+	def countPrecedingDetectors(self, providerASN):
+		precedingDetectors = dict()
+		detectorCount = 0
+
+		for neighbourASN in self.relationships[providerASN]:
+			precedingDetectors[neighbourASN] = detectorCount
+
+			if neighbourASN in self.detectorMasks:
+				detectorCount += 1
+
+		return precedingDetectors
+
+	"""
+	Collapses stubs with the same providers into aggregate nodes.
+
+	Stubs sharing their providers receive exactly the same messages, so they select the
+	same route. Every group of at least two such stubs is replaced by one aggregate BGPNode,
+	which acts on behalf of all its stubs. The providers address the aggregate once, at the
+	position of its first stub, instead of every stub separately.
+
+	A simulation may stop at a detector, leaving the messages queued after it unprocessed.
+	Stubs are therefore only grouped when no provider has a detector neighbour between
+	them, so either all or none of the stubs of an aggregate receive a message before
+	the simulation stops.
+	"""
+	def contractStubs(self):
+		stubGroups = dict()
+		precedingDetectors = dict()
 
 		for asn in self.relationships:
-			if asn in detectorASNs:
-				self.nodes[asn].setDetector(True)
+			if self.isContractibleStub(asn):
+				providerASNs = sorted(self.relationships[asn])
+				segments = []
+
+				for providerASN in providerASNs:
+					if providerASN not in precedingDetectors:
+						precedingDetectors[providerASN] = self.countPrecedingDetectors(providerASN)
+					segments.append(str(precedingDetectors[providerASN][asn]))
+
+				aggregateID = "stubs:" + "|".join(providerASNs) + ":" + "|".join(segments)
+
+				if aggregateID not in stubGroups:
+					stubGroups[aggregateID] = []
+				stubGroups[aggregateID].append(asn)
+
+		providers = dict()
+
+		for aggregateID in stubGroups:
+			if len(stubGroups[aggregateID]) < 2:
+				continue
+
+			stubs = stubGroups[aggregateID]
+			self.nodes[aggregateID] = BGPNode(aggregateID, None, None, dict(self.relationships[stubs[0]]))
+			self.stubAggregates[aggregateID] = stubs
+
+			for asn in stubs:
+				self.aggregateOf[asn] = aggregateID
+				del self.nodes[asn]
+
+			for providerASN in self.relationships[stubs[0]]:
+				providers[providerASN] = 1
+
+		for providerASN in providers:
+			self.nodes[providerASN].groupNeighbours(self.aggregateOf)
+
+	"""
+	Takes a stub out of its aggregate and restores it as an individual node.
+
+	This is required when a stub originates messages itself. The restored node starts
+	from the RIB of its aggregate, as it would have selected the same routes. It stays an
+	individual node until 'recontractStubs' is called, which the BGPSimulator does on
+	every reset outside hijack mode.
+
+	Input argument:
+		(a) asn: string - The ASN of the stub.
+	"""
+	def expandStub(self, asn):
+		aggregateID = self.aggregateOf.pop(asn)
+		self.stubAggregates[aggregateID].remove(asn)
+		self.expandedStubs[asn] = aggregateID
+
+		self.nodes[asn] = BGPNode(asn, None, None, self.relationships[asn])
+		self.nodes[asn].copyRIB(self.nodes[aggregateID])
+
+		for providerASN in self.relationships[asn]:
+			self.nodes[providerASN].groupNeighbours(self.aggregateOf)
+
+	"""
+	Collapses all stubs restored by 'expandStub' into their aggregates again.
+
+	Only to be used when no node in the graph holds any routing information.
+	"""
+	def recontractStubs(self):
+		providers = dict()
+
+		for asn in self.expandedStubs:
+			self.stubAggregates[self.expandedStubs[asn]].append(asn)
+			self.aggregateOf[asn] = self.expandedStubs[asn]
+			del self.nodes[asn]
+
+			for providerASN in self.relationships[asn]:
+				providers[providerASN] = 1
+
+		self.expandedStubs.clear()
+
+		for providerASN in providers:
+			self.nodes[providerASN].groupNeighbours(self.aggregateOf)
 
 	"Getters"
 	def getGraph(self):
 		return self.nodes
+
+	def getRelationships(self):
+		return self.relationships
+
+	def getCollectorNames(self):
+		return self.collectorNames
+
+	def getCollectorMasks(self):
+		return self.collectorMasks
+
+	def getProjectMasks(self):
+		return self.projectMasks
+
+	def getStubAggregates(self):
+		return self.stubAggregates
+
+	def getAggregateOf(self):
+		return self.aggregateOf
@@ -0,0 +1,320 @@
+from statistics import NormalDist
+
+import math
+import random
+
+
+"""
+Class for estimating the fraction of hijacks caught by route collectors.
+
+Instead of simulating every (victim, attacker) pair, random pairs are drawn and
+simulated one by one. After every simulation the estimated fraction of hijacks
+caught by every collector set is updated together with its confidence interval,
+until the requested precision is reached.
+
+The pairs can be stratified by a property of the attacker, either its tier or the
+size of its customer cone. Every stratum is weighted by its share of all ASes, and
+new samples are drawn from the stratum reducing the variance of the estimates most.
+
+The ASes and strata are taken from the snapshot active when the sampler is created.
+A sampler can only be used with that snapshot, create a new sampler after switching
+the simulator to another snapshot.
+
+Input arguments:
+	(a) simulator: BGPSimulator - The simulator used to simulate the hijacks.
+	(b) collectorSets: list - Names of the collector projects and/or individual
+							 collectors to estimate, all collector projects when omitted.
+	(c) stratifyBy: string - Stratification of the attackers, either None, 'tier'
+							or 'cone'.
+	(d) seed: integer - Seed for drawing the pairs.
+"""
+class HijackSampler:
+
+	"""
+	Constructor for object of class HijackSampler.
+	Divides all ASes of the simulator's graph into strata.
+	"""
+	def __init__(self, simulator, collectorSets=None, stratifyBy=None, seed=None):
+		self.simulator = simulator
+		self.random = random.Random(seed)
+
+		if collectorSets is None:
+			collectorSets = list(simulator.getProjectDetections())
+		self.collectorSets = collectorSets
+
+		self.snapshot = simulator.getActiveSnapshot()
+		self.asns = simulator.getASNs()
+
+		if len(self.asns) < 2:
+			raise ValueError("Sampling hijacks requires at least two ASes")
+
+		self.strata = self.createStrata(stratifyBy)
+
+		"Per stratum: number of samples and number of hijacks caught per collector set"
+		self.sampleCounts = { stratum:0 for stratum in self.strata }
+		self.caughtCounts = { stratum:{ collectorSet:0 for collectorSet in collectorSets } for stratum in self.strata }
+
+	"""
+	Divides all ASes into strata.
+
+	Input argument:
+		(a) stratifyBy: string - Either None, 'tier' or 'cone'.
+	"""
+	def createStrata(self, stratifyBy):
+		if stratifyBy is None:
+			return {"all": self.asns}
+
+		if stratifyBy == "tier":
+			classify = self.getTier
+		elif stratifyBy == "cone":
+			classify = self.getConeStratum
+		else:
+			raise ValueError("Unknown stratification: " + str(stratifyBy))
+
+		strata = dict()
+
+		for asn in self.asns:
+			stratum = classify(asn)
+
+			if stratum not in strata:
+				strata[stratum] = []
+			strata[stratum].append(asn)
+
+		return strata
+
+	"""
+	Returns the tier of an AS: 'tier1' without any provider, 'stub' without any
+	customer and 'transit' otherwise.
+
+	Input argument:
+		(a) asn: string - The ASN of the AS.
+	"""
+	def getTier(self, asn):
+		relationTypes = [relation[0] for relation in self.simulator.getRelationships()[asn].values()]
+
+		if 2 not in relationTypes:
+			return "stub"
+		if 1 not in relationTypes:
+			return "tier1"
+		return "transit"
+
+	"""
+	Returns the size of the customer cone of an AS, the AS itself included.
+
+	Input argument:
+		(a) asn: string - The ASN of the AS.
+	"""
+	def getConeSize(self, asn):
+		relationships = self.simulator.getRelationships()
+		cone = {asn: 1}
+		stack = [asn]
+
+		while 0 != len(stack):
+			current = stack.pop()
+
+			for neighbourASN in relationships[current]:
+				if relationships[current][neighbourASN][0] == 2 and neighbourASN not in cone:
+					cone[neighbourASN] = 1
+					stack.append(neighbourASN)
+
+		return len(cone)
+
+	"""
+	Returns the customer cone stratum of an AS, its cone size rounded up to a power of 10.
+
+	Input argument:
+		(a) asn: string - The ASN of the AS.
+	"""
+	def getConeStratum(self, asn):
+		coneSize = self.getConeSize(asn)
+		bound = 1
+
+		while coneSize > bound:
+			bound *= 10
+
+		return "cone<=" + str(bound)
+
+	"""
+	Simulates a hijack of a victim's prefix by an attacker.
+
+	The legitimate announcement is fully propagated, after which the attacker originates
+	the same prefix. The hijack is propagated until a detector of every collector set
+	selected it. The simulator is fully reset afterwards.
+
+	Input arguments:
+		(a) victimASN: string - The ASN of the victim.
+		(b) attackerASN: string - The ASN of the attacker.
+	"""
+	def simulatePair(self, victimASN, attackerASN):
+		self.simulator.simulate(victimASN, [])
+		self.simulator.setToHijack(True)
+		self.simulator.reset()
+
+		self.simulator.simulate(attackerASN, self.collectorSets)
+		detections = self.simulator.getProjectDetections()
+		detections.update(self.simulator.getCollectorDetections())
+
+		self.simulator.resetAll()
+		return detections
+
+	"""
+	Draws a random pair with the attacker from the given stratum, simulates it
+	and updates the counts.
+
+	Input argument:
+		(a) stratum: string - The stratum to draw the attacker from.
+	"""
+	def sample(self, stratum):
+		if self.simulator.getActiveSnapshot() != self.snapshot:
+			raise ValueError("The simulator switched to another snapshot than the one of the sampler")
+
+		attackerASN = self.random.choice(self.strata[stratum])
+		victimASN = self.random.choice(self.asns)
+
+		while victimASN == attackerASN:
+			victimASN = self.random.choice(self.asns)
+
+		detections = self.simulatePair(victimASN, attackerASN)
+		self.sampleCounts[stratum] += 1
+
+		for collectorSet in self.collectorSets:
+			if detections[collectorSet] is not None:
+				self.caughtCounts[stratum][collectorSet] += 1
+
+	"""
+	Returns the variance of the fraction caught in a stratum, using a smoothed fraction
+	so a stratum without (un)caught hijacks does not appear to be certain.
+
+	Input arguments:
+		(a) stratum: string - The stratum.
+		(b) collectorSet: string - The collector set.
+	"""
+	def getStratumVariance(self, stratum, collectorSet):
+		smoothedFraction = (self.caughtCounts[stratum][collectorSet] + 1) / (self.sampleCounts[stratum] + 2)
+		return smoothedFraction * (1 - smoothedFraction)
+
+	def getStratumWeight(self, stratum):
+		return len(self.strata[stratum]) / len(self.asns)
+
+	"""
+	Selects the stratum to draw the next sample from.
+
+	Strata below the minimum number of samples go first. Otherwise the stratum for which
+	one more sample reduces the summed variance of all estimates most is selected.
+
+	Input argument:
+		(a) minSamplesPerStratum: integer - Minimum number of samples of every stratum.
+	"""
+	def selectStratum(self, minSamplesPerStratum):
+		bestStratum = None
+		bestReduction = -1
+
+		for stratum in self.strata:
+			sampleCount = self.sampleCounts[stratum]
+
+			if sampleCount < minSamplesPerStratum:
+				return stratum
+
+			variance = sum(self.getStratumVariance(stratum, collectorSet) for collectorSet in self.collectorSets)
+			reduction = self.getStratumWeight(stratum) ** 2 * variance / (sampleCount * (sampleCount + 1))
+
+			if reduction > bestReduction:
+				bestStratum = stratum
+				bestReduction = reduction
+
+		return bestStratum
+
+	"""
+	Returns a tuple with the stratified estimate of the fraction of hijacks caught by
+	a collector set and the half-width of its confidence interval.
+
+	Input arguments:
+		(a) collectorSet: string - The collector set.
+		(b) confidence: float - The confidence level of the interval.
+	"""
+	def getStratifiedEstimate(self, collectorSet, confidence):
+		estimate = 0.0
+		variance = 0.0
+
+		for stratum in self.strata:
+			sampleCount = self.sampleCounts[stratum]
+
+			if sampleCount == 0:
+				return (None, 1.0)
+
+			weight = self.getStratumWeight(stratum)
+			estimate += weight * self.caughtCounts[stratum][collectorSet] / sampleCount
+			variance += weight ** 2 * self.getStratumVariance(stratum, collectorSet) / sampleCount
+
+		return (estimate, NormalDist().inv_cdf(0.5 + confidence / 2) * math.sqrt(variance))
+
+	"""
+	Returns a tuple with the estimated fraction of hijacks caught by a collector set and
+	the lower and upper bound of its confidence interval.
+
+	Input arguments:
+		(a) collectorSet: string - The collector set.
+		(b) confidence: float - The confidence level of the interval.
+	"""
+	def getEstimate(self, collectorSet, confidence=0.95):
+		estimate, halfWidth = self.getStratifiedEstimate(collectorSet, confidence)
+
+		if estimate is None:
+			return (None, 0.0, 1.0)
+		return (estimate, max(0.0, estimate - halfWidth), min(1.0, estimate + halfWidth))
+
+	"""
+	Samples pairs until the half-width of the confidence interval of every collector set
+	is at most the requested precision, or the maximum number of samples is reached.
+
+	Samples from earlier calls are kept, so a call with a finer precision continues
+	where the previous one stopped.
+
+	Input arguments:
+		(a) precision: float - Maximum half-width of the confidence intervals.
+		(b) confidence: float - The confidence level of the intervals.
+		(c) maxSamples: integer - Maximum total number of samples.
+		(d) minSamplesPerStratum: integer - Minimum number of samples of every stratum.
+	"""
+	def estimate(self, precision=0.01, confidence=0.95, maxSamples=100000, minSamplesPerStratum=10):
+		while self.getSampleCount() < maxSamples:
+			if self.isPrecise(precision, confidence, minSamplesPerStratum):
+				break
+
+			self.sample(self.selectStratum(minSamplesPerStratum))
+
+		return self.getEstimates(confidence)
+
+	"""
+	Indicates whether every estimate reached the requested precision.
+
+	Input arguments:
+		(a) precision: float - Maximum half-width of the confidence intervals.
+		(b) confidence: float - The confidence level of the intervals.
+		(c) minSamplesPerStratum: integer - Minimum number of samples of every stratum.
+	"""
+	def isPrecise(self, precision, confidence, minSamplesPerStratum):
+		for stratum in self.strata:
+			if self.sampleCounts[stratum] < minSamplesPerStratum:
+				return False
+
+		for collectorSet in self.collectorSets:
+			_, halfWidth = self.getStratifiedEstimate(collectorSet, confidence)
+
+			if halfWidth > precision:
+				return False
+
+		return True
+
+	"Getters"
+	def getEstimates(self, confidence=0.95):
+		return { collectorSet:self.getEstimate(collectorSet, confidence) for collectorSet in self.collectorSets }
+
+	def getSampleCount(self):
+		return sum(self.sampleCounts.values())
+
+	def getSampleCounts(self):
+		return self.sampleCounts
+
+	def getStrata(self):
+		return self.strata
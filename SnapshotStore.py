@@ -0,0 +1,199 @@
+from BGPNode import BGPNode
+from GraphGenerator import GraphGenerator
+from RelationshipsReader import RelationshipsReader
+
+
+"""
+Class for storing multiple snapshots of the AS graph.
+
+The graph of a base relationship file is constructed once. Every other relationship
+file, e.g. of another month, is only stored as the difference with the base graph:
+the neighbours of the ASes whose links differ and the ASes that appear or disappear.
+
+Switching to another snapshot happens in place. Only the neighbours of the ASes whose
+links differ are replaced, and only those ASes regroup their neighbours, while all other
+nodes of the graph are left untouched. The neighbours are stored as formatted for the
+snapshot, so their order, and with it the order in which messages are sent, is the same
+as in a graph constructed from the snapshot's relationship file.
+
+Stub contraction is not supported, as the stubs differ between snapshots.
+
+Class variables:
+	(a) fileLocationRelations: string - The location of the base CAIDA AS relationship file.
+	(b) locationDelegatedFiles: string - The location to the folder containing the RIR
+										delegated files.
+"""
+class SnapshotStore(GraphGenerator):
+
+	def __init__(self, fileLocationRelations, locationDelegatedFiles):
+		GraphGenerator.__init__(self, fileLocationRelations, locationDelegatedFiles)
+
+		"Per snapshot: a tuple with the changed neighbours, the added ASNs and the removed ASNs"
+		self.snapshots = dict()
+		self.activeSnapshot = None
+
+		"Nodes and relations of the base graph missing in the active snapshot"
+		self.removedNodes = dict()
+
+	"""
+	Constructs the base graph.
+
+	Input argument:
+		(a) contractStubs: boolean - Has to be False, contraction is not supported.
+	"""
+	def constructGraph(self, contractStubs=False):
+		if contractStubs:
+			raise ValueError("Stubs can not be contracted in a graph with snapshots")
+
+		GraphGenerator.constructGraph(self)
+
+	"""
+	Parses, filters and formats the relation data of a snapshot.
+
+	Input argument:
+		(a) fileLocationRelations: string - The location of the CAIDA AS relationship file.
+	"""
+	def retrieveSnapshotRelations(self, fileLocationRelations):
+		rr = RelationshipsReader(fileLocationRelations)
+		rr.parse()
+		return self.formatRelations(self.filterRelations(rr.getRelationships()))
+
+	"""
+	Adds a snapshot, stored as the difference with the base graph.
+
+	For every AS whose neighbours differ from the base graph, either in their relations
+	or in their order, a tuple with its base and snapshot neighbours is stored.
+
+	Input arguments:
+		(a) name: string - The name of the snapshot.
+		(b) fileLocationRelations: string - The location of the CAIDA AS relationship file.
+	"""
+	def addSnapshot(self, name, fileLocationRelations):
+		relationships = self.retrieveSnapshotRelations(fileLocationRelations)
+
+		"The difference is taken with the base graph"
+		activeSnapshot = self.activeSnapshot
+		self.setActiveSnapshot(None)
+
+		links = dict()
+
+		for asn in relationships:
+			baseNeighbours = self.relationships.get(asn, dict())
+			neighbours = relationships[asn]
+
+			if list(baseNeighbours.items()) != list(neighbours.items()):
+				links[asn] = (dict(baseNeighbours), neighbours)
+
+		addedASNs = [asn for asn in relationships if asn not in self.relationships]
+		removedASNs = [asn for asn in self.relationships if asn not in relationships]
+
+		self.snapshots[name] = (links, addedASNs, removedASNs)
+		self.setActiveSnapshot(activeSnapshot)
+
+	"""
+	Switches the graph to another snapshot in place.
+
+	The active snapshot is reverted to the base graph, after which the requested snapshot
+	is applied. Only the nodes with changed links regroup their neighbours. The RIBs of the
+	nodes are left as they are, so the graph should be reset before switching.
+	Returns the ASNs of the nodes that were created.
+
+	Input argument:
+		(a) name: string - The name of the snapshot, None for the base graph.
+	"""
+	def setActiveSnapshot(self, name):
+		if name is not None and name not in self.snapshots:
+			raise ValueError("Unknown snapshot: " + str(name))
+
+		if name == self.activeSnapshot:
+			return []
+
+		changedASNs = dict()
+		createdASNs = []
+
+		if self.activeSnapshot is not None:
+			createdASNs += self.revertSnapshot(self.snapshots[self.activeSnapshot], changedASNs)
+
+		if name is not None:
+			createdASNs += self.applySnapshot(self.snapshots[name], changedASNs)
+
+		for asn in changedASNs:
+			if asn in self.nodes:
+				self.nodes[asn].groupNeighbours()
+
+		self.activeSnapshot = name
+		return [asn for asn in createdASNs if asn in self.nodes]
+
+	"""
+	Applies a snapshot to the base graph.
+	Returns the ASNs of the nodes that were created.
+
+	Input arguments:
+		(a) snapshot: tuple - The changed neighbours, added ASNs and removed ASNs.
+		(b) changedASNs: dictionary - Collects the ASNs whose links changed.
+	"""
+	def applySnapshot(self, snapshot, changedASNs):
+		links, addedASNs, removedASNs = snapshot
+
+		for asn in removedASNs:
+			self.removedNodes[asn] = (self.nodes.pop(asn), self.relationships.pop(asn))
+
+		for asn in addedASNs:
+			self.relationships[asn] = dict()
+			self.nodes[asn] = BGPNode(asn, None, None, self.relationships[asn])
+
+			if asn in self.detectorMasks:
+				self.nodes[asn].setCollectors(self.detectorMasks[asn])
+
+		for asn in links:
+			self.updateLinks(asn, links[asn], 1)
+			changedASNs[asn] = 1
+
+		return addedASNs
+
+	"""
+	Reverts a snapshot to the base graph.
+	Returns the ASNs of the nodes that were restored.
+
+	Input arguments:
+		(a) snapshot: tuple - The changed neighbours, added ASNs and removed ASNs.
+		(b) changedASNs: dictionary - Collects the ASNs whose links changed.
+	"""
+	def revertSnapshot(self, snapshot, changedASNs):
+		links, addedASNs, removedASNs = snapshot
+
+		for asn in links:
+			self.updateLinks(asn, links[asn], 0)
+			changedASNs[asn] = 1
+
+		for asn in addedASNs:
+			del self.nodes[asn]
+			del self.relationships[asn]
+
+		"Restored nodes may have been removed while their links changed"
+		for asn in removedASNs:
+			self.nodes[asn], self.relationships[asn] = self.removedNodes.pop(asn)
+			changedASNs[asn] = 1
+
+		return removedASNs
+
+	"""
+	Replaces the neighbours of an AS by either its base or snapshot neighbours.
+	The dictionary itself is kept, as it is shared with the node of the AS.
+
+	Input arguments:
+		(a) asn: string - The ASN of the AS.
+		(b) changedNeighbours: tuple - The base and snapshot neighbours.
+		(c) version: integer - 0 for the base neighbours, 1 for the snapshot neighbours.
+	"""
+	def updateLinks(self, asn, changedNeighbours, version):
+		neighbours = self.relationships[asn]
+		neighbours.clear()
+		neighbours.update(changedNeighbours[version])
+
+	"Getters"
+	def getActiveSnapshot(self):
+		return self.activeSnapshot
+
+	def getSnapshotNames(self):
+		return list(self.snapshots)
@@ -0,0 +1,44 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from BGPSimulator import BGPSimulator
+from GraphGenerator import GraphGenerator
+
+
+"""
+Creates a simulator from CAIDA-formatted relationship lines.
+
+Every ASN from 1 up to 1000 is allocated, and the route collectors are passed as a
+dictionary per collector project instead of being read from the collectors file.
+Snapshots are passed as relationship lines by snapshot name.
+"""
+@pytest.fixture
+def createSimulator(tmp_path, monkeypatch):
+	def create(relations, collectorProjects, contractStubs=False, valleyFree=True, snapshots=None):
+		relationsFile = tmp_path / "relationships.txt"
+		relationsFile.write_text("\n".join(relations) + "\n")
+
+		snapshotFiles = None
+
+		if snapshots is not None:
+			snapshotFiles = dict()
+
+			for name in snapshots:
+				snapshotFile = tmp_path / ("relationships-" + name + ".txt")
+				snapshotFile.write_text("\n".join(snapshots[name]) + "\n")
+				snapshotFiles[name] = str(snapshotFile)
+
+		delegatedFolder = tmp_path / "delegated"
+		delegatedFolder.mkdir(exist_ok=True)
+		(delegatedFolder / "delegated-test").write_text("test|ZZ|asn|1|1000|20200101|allocated\n")
+
+		monkeypatch.setattr(GraphGenerator, "retrieveCollectorProjects", lambda self: collectorProjects)
+
+		simulator = BGPSimulator(str(relationsFile), str(delegatedFolder), contractStubs, snapshotFiles)
+		simulator.setValleyFree(valleyFree)
+		return simulator
+
+	return create
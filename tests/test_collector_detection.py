@@ -0,0 +1,44 @@
+"""
+Tier-1 AS 1 has the customers 2 and 3. The source 4 is a customer of 2 and 5 is a
+customer of 3. RIPE RIS peers with 2 and 5, RouteViews with 3 and PCH with an AS
+outside the graph.
+"""
+RELATIONS = [
+	"1|2|-1|bgp",
+	"1|3|-1|bgp",
+	"2|4|-1|bgp",
+	"3|5|-1|bgp",
+]
+
+COLLECTORS = {"ripe": {"rrc00": ["2"], "rrc01": ["5"]}, "routeviews": {"route-views2": ["3"]}, "pch": {"pch1": ["999"]}}
+
+
+def test_hops_per_collector(createSimulator):
+	simulator = createSimulator(RELATIONS, COLLECTORS)
+	simulator.simulate("4", [])
+
+	"The hop is the number of ASes in the path selected by the detector"
+	assert simulator.getCollectorDetections() == {"rrc00": 1, "rrc01": 4, "route-views2": 3, "pch1": None}
+
+
+def test_hops_per_project(createSimulator):
+	simulator = createSimulator(RELATIONS, COLLECTORS)
+	simulator.simulate("4", [])
+
+	"A project catches the message at the first hop of any of its collectors"
+	assert simulator.getProjectDetections() == {"all": 1, "ripe": 1, "routeviews": 3, "pch": None}
+
+
+def test_stops_at_first_detector_by_default(createSimulator):
+	simulator = createSimulator(RELATIONS, COLLECTORS)
+	simulator.simulate("4")
+
+	assert simulator.getCollectorDetections() == {"rrc00": 1, "rrc01": None, "route-views2": None, "pch1": None}
+	assert "5" not in simulator.getUsedBGPNodes()
+
+
+def test_stops_once_requested_sets_resolved(createSimulator):
+	simulator = createSimulator(RELATIONS, COLLECTORS)
+	simulator.simulate("4", ["routeviews"])
+
+	assert simulator.getCollectorDetections() == {"rrc00": 1, "rrc01": None, "route-views2": 3, "pch1": None}
@@ -0,0 +1,82 @@
+import pytest
+
+from HijackSampler import HijackSampler
+
+
+"""
+Tier-1 ASes 1 and 2 peer with each other. The victim 30 is a customer of 11, which is
+a customer of 1. The attacker 10 is a transit AS, multi-homed to 1 and 2, with the
+customer 40. The detector 2 peers with RIPE RIS, the detector 11 with RouteViews.
+"""
+RELATIONS = [
+	"1|2|0|bgp",
+	"1|11|-1|bgp",
+	"11|30|-1|bgp",
+	"1|10|-1|bgp",
+	"2|10|-1|bgp",
+	"10|40|-1|bgp",
+]
+
+COLLECTORS = {"ripe": {"rrc00": ["2"]}, "routeviews": {"route-views2": ["11"]}, "pch": {}}
+
+
+def hijack(simulator, victimASN, attackerASN):
+	simulator.simulate(victimASN, [])
+	simulator.setToHijack(True)
+	simulator.reset()
+	simulator.simulate(attackerASN, [])
+
+
+def test_attacker_originates_prefix(createSimulator):
+	simulator = createSimulator(RELATIONS, COLLECTORS)
+	hijack(simulator, "30", "10")
+
+	selectedPaths = simulator.getSelectedPaths()
+	assert selectedPaths["10"] is None
+	assert selectedPaths["2"] == "10"
+	assert selectedPaths["40"] == "10"
+
+
+def test_hijack_by_multi_homed_transit_is_detected(createSimulator):
+	simulator = createSimulator(RELATIONS, COLLECTORS)
+	hijack(simulator, "30", "10")
+
+	"2 prefers the hijacked route from its customer, 11 keeps the route of its customer"
+	assert simulator.isCaught()
+	assert simulator.getCollectorDetections() == {"rrc00": 1, "route-views2": None}
+	assert simulator.getProjectDetections() == {"all": 1, "ripe": 1, "routeviews": None, "pch": None}
+
+
+def test_sampled_pair_is_detected(createSimulator):
+	simulator = createSimulator(RELATIONS, COLLECTORS)
+	sampler = HijackSampler(simulator, seed=1)
+
+	detections = sampler.simulatePair("30", "10")
+	assert detections["ripe"] == 1
+	assert detections["routeviews"] is None
+
+	"The simulator is fully reset afterwards"
+	assert simulator.getUsedBGPNodes() == {}
+	assert all(bgpnode.getSelectedRoute() is None for bgpnode in simulator.graph.values())
+
+
+def test_sampler_requires_two_ases(createSimulator):
+	"AS 2000 is not allocated, leaving a graph of AS 1 only"
+	simulator = createSimulator(["1|2000|-1|bgp"], COLLECTORS)
+	assert simulator.getASNs() == ["1"]
+
+	with pytest.raises(ValueError):
+		HijackSampler(simulator)
+
+
+def test_attacker_peering_with_collector_is_detected(createSimulator):
+	collectors = {"ripe": {"rrc00": ["10"]}, "routeviews": {"route-views2": ["11"]}, "pch": {}}
+	simulator = createSimulator(RELATIONS, collectors)
+	sampler = HijackSampler(simulator, seed=1)
+
+	"The attacker itself is caught at hop 0"
+	detections = sampler.simulatePair("30", "10")
+	assert detections["rrc00"] == 0
+	assert detections["ripe"] == 0
+	assert detections["all"] == 0
+	assert detections["routeviews"] is None
@@ -0,0 +1,72 @@
+from HijackSampler import HijackSampler
+
+
+"""
+Tier-1 ASes 1 and 2 peer with each other. 11 is a customer of 1 with the customer 30,
+10 is a customer of both 1 and 2 with the customer 40. RIPE RIS peers with 2,
+RouteViews with 11.
+"""
+RELATIONS = [
+	"1|2|0|bgp",
+	"1|11|-1|bgp",
+	"11|30|-1|bgp",
+	"1|10|-1|bgp",
+	"2|10|-1|bgp",
+	"10|40|-1|bgp",
+]
+
+COLLECTORS = {"ripe": {"rrc00": ["2"]}, "routeviews": {"route-views2": ["11"]}, "pch": {}}
+
+
+def getStrata(sampler):
+	return { stratum:sorted(asns) for stratum, asns in sampler.getStrata().items() }
+
+
+def test_tier_strata(createSimulator):
+	sampler = HijackSampler(createSimulator(RELATIONS, COLLECTORS), stratifyBy="tier")
+	assert getStrata(sampler) == {"tier1": ["1", "2"], "transit": ["10", "11"], "stub": ["30", "40"]}
+
+
+def test_cone_strata(createSimulator):
+	sampler = HijackSampler(createSimulator(RELATIONS, COLLECTORS), stratifyBy="cone")
+
+	"The cone of 1 holds 1, 10, 11, 30 and 40"
+	assert sampler.getConeSize("1") == 5
+	assert sampler.getConeSize("2") == 3
+	assert getStrata(sampler) == {"cone<=1": ["30", "40"], "cone<=10": ["1", "10", "11", "2"]}
+
+
+def test_under_sampled_strata_are_selected_first(createSimulator):
+	sampler = HijackSampler(createSimulator(RELATIONS, COLLECTORS), stratifyBy="cone", seed=1)
+
+	for _ in range(2):
+		sampler.sample(sampler.selectStratum(1))
+	assert sampler.getSampleCounts() == {"cone<=1": 1, "cone<=10": 1}
+
+	"With equal variances the stratum with the largest weight reduces the variance most"
+	assert sampler.selectStratum(1) == "cone<=10"
+
+
+def test_estimate_stops_at_precision(createSimulator):
+	sampler = HijackSampler(createSimulator(RELATIONS, COLLECTORS), seed=1)
+	estimates = sampler.estimate(precision=0.3, minSamplesPerStratum=1)
+	sampleCount = sampler.getSampleCount()
+
+	assert sampler.isPrecise(0.3, 0.95, 1)
+	assert all(upper - lower <= 0.6 for _, lower, upper in estimates.values())
+
+	"One sample fewer does not reach the precision"
+	sampler = HijackSampler(createSimulator(RELATIONS, COLLECTORS), seed=1)
+	for _ in range(sampleCount - 1):
+		sampler.sample("all")
+	assert not sampler.isPrecise(0.3, 0.95, 1)
+
+
+def test_estimate_respects_max_samples(createSimulator):
+	sampler = HijackSampler(createSimulator(RELATIONS, COLLECTORS), seed=1)
+	sampler.estimate(precision=0.0, maxSamples=7)
+	assert sampler.getSampleCount() == 7
+
+	"Samples of earlier calls are kept"
+	sampler.estimate(precision=0.0, maxSamples=9)
+	assert sampler.getSampleCount() == 9
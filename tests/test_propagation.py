@@ -0,0 +1,30 @@
+from BGPNode import BGPNode
+
+
+"""
+Provider 1 has the customers 10 and 11, which are both providers of the multi-homed 30.
+"""
+RELATIONS = [
+	"1|10|-1|bgp",
+	"1|11|-1|bgp",
+	"10|30|-1|bgp",
+	"11|30|-1|bgp",
+]
+
+COLLECTORS = {"ripe": {}, "routeviews": {}, "pch": {}}
+
+
+def test_unchanged_route_is_not_shared_again():
+	bgpnode = BGPNode("1", None, None, {"10": (2, 0), "11": (2, 0)})
+
+	assert bgpnode.updateSelectedPath("30,10")
+	assert not bgpnode.updateSelectedPath("30,11")
+	assert not bgpnode.updateSelectedPath("30,10")
+
+
+def test_multi_homed_origin_converges(createSimulator):
+	simulator = createSimulator(RELATIONS, COLLECTORS)
+	simulator.simulate("30", [])
+
+	assert simulator.getSelectedPaths() == {"30": None, "10": "30", "11": "30", "1": "30,10"}
+	assert simulator.getProcessedMessages() < 10
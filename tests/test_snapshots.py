@@ -0,0 +1,116 @@
+import pytest
+
+from HijackSampler import HijackSampler
+
+
+"""
+In the base graph tier-1 ASes 1 and 2 peer with each other. 10 is a customer of 1 with
+the customers 30 and 40, and 20 is a customer of 2 with the customer 30.
+
+In the month snapshot 40 disappears, 50 appears as a customer of 2 and 20 becomes a
+customer of 1 as well, listed before 10.
+"""
+RELATIONS = [
+	"1|2|0|bgp",
+	"1|10|-1|bgp",
+	"2|20|-1|bgp",
+	"10|30|-1|bgp",
+	"20|30|-1|bgp",
+	"10|40|-1|bgp",
+]
+
+MONTH = [
+	"1|2|0|bgp",
+	"1|20|-1|bgp",
+	"1|10|-1|bgp",
+	"2|20|-1|bgp",
+	"2|50|-1|bgp",
+	"10|30|-1|bgp",
+	"20|30|-1|bgp",
+]
+
+COLLECTORS = {"ripe": {"rrc00": ["30"]}, "routeviews": {"route-views2": ["50"]}, "pch": {"pch1": ["40"]}}
+
+
+def test_unknown_snapshot_leaves_graph_intact(createSimulator):
+	simulator = createSimulator(RELATIONS, COLLECTORS, snapshots={"month": MONTH})
+	simulator.setSnapshot("month")
+	relationships = { asn:list(neighbours.items()) for asn, neighbours in simulator.getRelationships().items() }
+
+	with pytest.raises(ValueError):
+		simulator.setSnapshot("typo")
+
+	assert simulator.graphGenerator.getActiveSnapshot() == "month"
+	assert { asn:list(neighbours.items()) for asn, neighbours in simulator.getRelationships().items() } == relationships
+
+	simulator.setSnapshot(None)
+	assert sorted(simulator.getASNs()) == ["1", "10", "2", "20", "30", "40"]
+
+
+def describe(simulator):
+	graph = simulator.graph
+
+	return {
+		"neighbours": { asn:list(simulator.getRelationships()[asn].items()) for asn in graph },
+		"groupedNeighbours": { asn:graph[asn].groupedNeighbours for asn in graph },
+		"collectorMasks": { asn:graph[asn].getCollectorMask() for asn in graph },
+	}
+
+
+def test_switched_snapshot_matches_fresh_graph(createSimulator):
+	base = describe(createSimulator(RELATIONS, COLLECTORS))
+	month = describe(createSimulator(MONTH, COLLECTORS))
+	simulator = createSimulator(RELATIONS, COLLECTORS, snapshots={"month": MONTH})
+
+	"The neighbours of 1 are in the order of the month's relationship file"
+	simulator.setSnapshot("month")
+	assert describe(simulator) == month
+	assert list(simulator.getRelationships()["1"]) == ["2", "20", "10"]
+
+	simulator.setSnapshot(None)
+	assert describe(simulator) == base
+
+
+def test_added_and_removed_ases(createSimulator):
+	simulator = createSimulator(RELATIONS, COLLECTORS, snapshots={"month": MONTH})
+
+	simulator.setSnapshot("month")
+	assert sorted(simulator.getASNs()) == ["1", "10", "2", "20", "30", "50"]
+	assert simulator.graph["50"].isDetector()
+
+	simulator.setSnapshot(None)
+	assert sorted(simulator.getASNs()) == ["1", "10", "2", "20", "30", "40"]
+	assert simulator.graph["40"].isDetector()
+	assert "40" in simulator.getRelationships()["10"]
+
+
+def test_simulation_matches_fresh_graph(createSimulator):
+	month = createSimulator(MONTH, COLLECTORS)
+	simulator = createSimulator(RELATIONS, COLLECTORS, snapshots={"month": MONTH})
+	simulator.setSnapshot("month")
+
+	for asn in month.getASNs():
+		month.simulate(asn, [])
+		simulator.simulate(asn, [])
+
+		assert simulator.getSelectedPaths() == month.getSelectedPaths()
+		assert simulator.getCollectorDetections() == month.getCollectorDetections()
+		assert simulator.getProcessedMessages() == month.getProcessedMessages()
+
+		month.resetAll()
+		simulator.resetAll()
+
+
+def test_sampler_requires_its_own_snapshot(createSimulator):
+	simulator = createSimulator(RELATIONS, COLLECTORS, snapshots={"month": MONTH})
+	sampler = HijackSampler(simulator, seed=1)
+	simulator.setSnapshot("month")
+
+	"40 is missing in the month snapshot"
+	with pytest.raises(ValueError):
+		sampler.estimate(maxSamples=10)
+
+	sampler = HijackSampler(simulator, seed=1)
+	sampler.estimate(maxSamples=10)
+	assert sampler.getSampleCount() == 10
+	assert "40" not in sampler.getStrata()["all"]
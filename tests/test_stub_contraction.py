@@ -0,0 +1,65 @@
+"""
+Provider 1 has the customers 10, 5, 11, 2, 12 and 13 in that order, of which 5 is a
+detector, and peers with 3. Provider 3 has the customers 20, 21 and 22.
+"""
+RELATIONS = [
+	"1|10|-1|bgp",
+	"1|5|-1|bgp",
+	"1|11|-1|bgp",
+	"1|2|-1|bgp",
+	"1|12|-1|bgp",
+	"1|13|-1|bgp",
+	"1|3|0|bgp",
+	"3|20|-1|bgp",
+	"3|21|-1|bgp",
+	"3|22|-1|bgp",
+]
+
+COLLECTORS = {"ripe": {"rrc00": ["5"]}, "routeviews": {"route-views2": ["22"]}, "pch": {}}
+
+
+def simulateBoth(createSimulator, sourceASN, collectorSets):
+	full = createSimulator(RELATIONS, COLLECTORS)
+	contracted = createSimulator(RELATIONS, COLLECTORS, contractStubs=True)
+
+	for simulator in (full, contracted):
+		simulator.simulate(sourceASN, collectorSets)
+
+	return full, contracted
+
+
+def test_stubs_are_contracted(createSimulator):
+	full = createSimulator(RELATIONS, COLLECTORS)
+	contracted = createSimulator(RELATIONS, COLLECTORS, contractStubs=True)
+
+	assert len(contracted.graph) < len(full.graph)
+	assert sorted(map(sorted, contracted.stubAggregates.values())) == [["11", "12", "13", "2"], ["20", "21"]]
+
+
+def test_selected_paths_identical_to_full_graph(createSimulator):
+	for sourceASN in ["1", "2", "3", "5", "10", "20"]:
+		full, contracted = simulateBoth(createSimulator, sourceASN, [])
+
+		assert contracted.getSelectedPaths() == full.getSelectedPaths()
+		assert contracted.getCollectorDetections() == full.getCollectorDetections()
+		assert contracted.getProcessedMessages() <= full.getProcessedMessages()
+
+
+def test_selected_paths_identical_when_stopping_early(createSimulator):
+	full, contracted = simulateBoth(createSimulator, "2", ["rrc00"])
+
+	assert sorted(full.getUsedBGPNodes()) == ["1", "10", "2", "3", "5"]
+	assert contracted.getSelectedPaths() == full.getSelectedPaths()
+
+
+def test_reset_collapses_originating_stub(createSimulator):
+	contracted = createSimulator(RELATIONS, COLLECTORS, contractStubs=True)
+	nodeCount = len(contracted.graph)
+
+	contracted.simulate("12", [])
+	assert "12" in contracted.graph
+
+	contracted.reset()
+	assert "12" not in contracted.graph
+	assert len(contracted.graph) == nodeCount
+	assert "12" in contracted.graphGenerator.getAggregateOf()